@@ -3,36 +3,190 @@ Email Hunter Script
 Finds and extracts all email addresses from messy text.
 """
 
+import hashlib
 import re
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import Iterator, List, Tuple, Union
 
+# Email regex pattern
+_EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'
 
-def find_emails(text: str) -> List[str]:
+# Compiled once at import time
+_EMAIL_RE = re.compile(_EMAIL_PATTERN)
+
+# RFC 5321 length limits, used to size the text searched around each '@'
+_MAX_LOCAL_PART = 64
+_MAX_DOMAIN = 255
+
+# Characters that can appear in an address besides '@', plus any other word
+# characters, since \b treats those alike. Search windows are widened until
+# the characters on either side of them are not in this set, so slicing never
+# introduces a word boundary that isn't in the text. Bytes count every
+# non-ASCII byte as a possible part of a word character.
+_EMAIL_CHARS_RE = re.compile(r'[\w.%+-]*')
+_EMAIL_CHARS_BYTES_RE = re.compile(rb'[\w.%+\x80-\xff-]*')
+
+# Recent find_emails results, keyed by a BLAKE2b digest of the input text so
+# the texts themselves are not kept alive. Bounded both by entry count and by
+# the total number of cached emails. Hashing the text costs more than
+# scanning it when there are only a few '@'s, so such texts bypass the cache.
+_CACHE_MIN_AT_SIGNS = 256
+_CACHE_MAX_ENTRIES = 1024
+_CACHE_MAX_EMAILS = 100_000
+_cache: "OrderedDict[bytes, Tuple[str, ...]]" = OrderedDict()
+_cache_emails = 0
+_cache_lock = threading.Lock()
+
+
+def _candidate_spans(text: Union[str, bytes]) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the (start, end) spans of text that can contain an email.
+
+    Every email contains an '@', so the search starts from a window of
+    _MAX_LOCAL_PART characters before each '@' and _MAX_DOMAIN after it.
+    Each window edge is then moved outwards until it sits next to a
+    character that is neither part of an address nor a word character (or
+    the end of the text), so matches in a span always equal matches in the
+    full text. Windows of overlapping '@'s are merged so dense text is still
+    scanned in a few large slices.
+    """
+    if isinstance(text, bytes):
+        at_sign, run_end = b'@', _EMAIL_CHARS_BYTES_RE.match
+    else:
+        at_sign, run_end = '@', _EMAIL_CHARS_RE.match
+
+    # Jump straight to the last '@' whose window overlaps the current one,
+    # so the loop runs once per window extension rather than once per '@'
+    length = len(text)
+    at = text.find(at_sign)
+    while at != -1:
+        start = _run_start(text, max(at - _MAX_LOCAL_PART, 0))
+        end = run_end(text, min(at + 1 + _MAX_DOMAIN, length)).end()
+        while True:
+            at = text.rfind(at_sign, at + 1, end + _MAX_LOCAL_PART + 1)
+            if at == -1:
+                break
+            end = run_end(text, min(at + 1 + _MAX_DOMAIN, length)).end()
+        yield start, end
+        at = text.find(at_sign, end + _MAX_LOCAL_PART + 1)
+
+
+def _run_start(text: Union[str, bytes], pos: int) -> int:
+    """Move pos back to the start of the run of address characters it is in."""
+    run = _EMAIL_CHARS_BYTES_RE if isinstance(text, bytes) else _EMAIL_CHARS_RE
+
+    # Skip back over whole blocks of address characters first, then step
+    # through the block where the run begins
+    while pos > 0:
+        block_start = max(pos - _MAX_LOCAL_PART, 0)
+        if run.fullmatch(text, block_start, pos) is None:
+            break
+        pos = block_start
+    while pos > 0 and run.fullmatch(text, pos - 1, pos) is not None:
+        pos -= 1
+    return pos
+
+
+def _candidate_texts(text: Union[str, bytes]) -> Iterator[str]:
+    """
+    Yield the parts of text that can contain an email, as str.
+
+    Raw bytes are decoded as UTF-8 one span at a time, so only the text
+    around each '@' is decoded. Span edges sit next to ASCII characters,
+    which never split a multi-byte sequence.
+    """
+    if isinstance(text, bytes):
+        for start, end in _candidate_spans(text):
+            yield text[start:end].decode('utf-8', 'replace')
+    else:
+        for start, end in _candidate_spans(text):
+            yield text[start:end]
+
+
+def _cache_key(text: Union[str, bytes]) -> bytes:
+    """Return the digest identifying text in the results cache."""
+    if isinstance(text, str):
+        text = text.encode('utf-8', 'surrogatepass')
+    return hashlib.blake2b(text, digest_size=16).digest()
+
+
+def _cache_store(key: bytes, emails: Tuple[str, ...]) -> None:
+    """Add a result to the cache, evicting the least recently used ones."""
+    global _cache_emails
+    if len(emails) > _CACHE_MAX_EMAILS:
+        return
+    with _cache_lock:
+        if key in _cache:
+            return
+        _cache[key] = emails
+        _cache_emails += len(emails)
+        while len(_cache) > _CACHE_MAX_ENTRIES or _cache_emails > _CACHE_MAX_EMAILS:
+            _, evicted = _cache.popitem(last=False)
+            _cache_emails -= len(evicted)
+
+
+def find_emails(text: Union[str, bytes]) -> List[str]:
     """
     Extract all email addresses from text.
 
+    Repeated texts with many '@'s are answered from a small LRU cache of
+    recent results.
+
     Args:
-        text: Input text that may contain email addresses
+        text: Input text that may contain email addresses, either as str or
+            as UTF-8 encoded bytes
 
     Returns:
         List of unique email addresses found
     """
-    # Email regex pattern
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    if text.count(b'@' if isinstance(text, bytes) else '@') < _CACHE_MIN_AT_SIGNS:
+        return _find_unique_emails(text)
+
+    key = _cache_key(text)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+    if cached is not None:
+        return list(cached)
+
+    emails = _find_unique_emails(text)
+    _cache_store(key, tuple(emails))
+    return emails
 
-    # Find all matches
-    emails = re.findall(email_pattern, text)
 
-    # Return unique emails while preserving order
+def _find_unique_emails(text: Union[str, bytes]) -> List[str]:
+    """Extract unique email addresses from text, bypassing the cache."""
+    # Return unique emails while preserving order; dicts keep insertion
+    # order and setdefault keeps the first spelling seen for each address
+    unique_emails = {}
+    for candidate in _candidate_texts(text):
+        for email in _EMAIL_RE.findall(candidate):
+            unique_emails.setdefault(email.lower(), email)
+
+    return list(unique_emails.values())
+
+
+def iter_emails(text: Union[str, bytes]) -> Iterator[str]:
+    """
+    Lazily yield unique email addresses from text.
+
+    Args:
+        text: Input text that may contain email addresses, as str or UTF-8
+            encoded bytes
+
+    Yields:
+        Each unique email address, in the order it first appears
+    """
     seen = set()
-    unique_emails = []
-    for email in emails:
-        email_lower = email.lower()
-        if email_lower not in seen:
-            seen.add(email_lower)
-            unique_emails.append(email)
-
-    return unique_emails
+    for candidate in _candidate_texts(text):
+        for match in _EMAIL_RE.finditer(candidate):
+            email = match.group()
+            email_lower = email.lower()
+            if email_lower not in seen:
+                seen.add(email_lower)
+                yield email
 
 
 def hunt_emails(text: str) -> dict:
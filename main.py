@@ -5,6 +5,8 @@ A FastAPI service for extracting email addresses from text.
 Endpoints:
 - GET /: Health check
 - POST /api/extract-emails: Extract emails from text (requires API key)
+- POST /api/extract-emails/stream: Stream emails from text as NDJSON (requires API key)
+- POST /api/extract-emails/raw: Extract emails from a raw text/plain body (requires API key)
 - POST /api/generate-key: Generate a test API key
 
 Author: Email Hunter API Team
@@ -12,40 +14,49 @@ Author: Email Hunter API Team
 
 from fastapi import FastAPI, HTTPException, status, Header, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.datastructures import Headers
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+import asyncio
+import codecs
 import sys
 import os
 import secrets
 import hashlib
+import json
+from itertools import islice
 from datetime import datetime
 
 # Add parent directory to path to import email_hunter module
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from email_hunter import find_emails, hunt_emails
+    from email_hunter import find_emails, hunt_emails, iter_emails
 except ImportError:
     # Fallback for deployment environments
     import re
-    from typing import List
+    
+    _EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
     
     def find_emails(text: str) -> List[str]:
         """Extract all email addresses from text."""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        seen = set()
-        unique_emails = []
+        if isinstance(text, bytes):
+            text = text.decode('utf-8', 'replace')
+        if '@' not in text:
+            return []
+        emails = _EMAIL_RE.findall(text)
+        unique_emails = {}
         for email in emails:
-            email_lower = email.lower()
-            if email_lower not in seen:
-                seen.add(email_lower)
-                unique_emails.append(email)
-        return unique_emails
+            unique_emails.setdefault(email.lower(), email)
+        return list(unique_emails.values())
+    
+    def iter_emails(text: str) -> Iterator[str]:
+        """Lazily yield unique email addresses from text."""
+        yield from find_emails(text)
     
     def hunt_emails(text: str) -> dict:
         """Main function to hunt for emails in text."""
@@ -58,14 +69,27 @@ except ImportError:
 
 
 # API Key Storage (in production, use a database)
-# For demo purposes, we'll use an in-memory store
-API_KEYS = {
-    "demo_key_12345": {
-        "name": "Demo Key",
-        "created_at": "2026-02-16T00:00:00Z",
-        "tier": "free"
-    }
-}
+# For demo purposes, we'll use an in-memory store keyed by the BLAKE2b
+# digest of each key, so requests are matched by a fixed-size digest
+# lookup instead of comparing raw key strings
+API_KEYS: Dict[bytes, dict] = {}
+
+
+def _hash_api_key(api_key: str) -> bytes:
+    """Return the digest used to index an API key in API_KEYS."""
+    return hashlib.blake2b(api_key.encode(), digest_size=16).digest()
+
+
+def _register_api_key(api_key: str, info: dict) -> None:
+    """Store API key information under the key's digest."""
+    API_KEYS[_hash_api_key(api_key)] = info
+
+
+_register_api_key("demo_key_12345", {
+    "name": "Demo Key",
+    "created_at": "2026-02-16T00:00:00Z",
+    "tier": "free"
+})
 
 # Environment variable for master API keys (comma-separated)
 MASTER_API_KEYS = os.getenv("API_KEYS", "").split(",")
@@ -73,15 +97,41 @@ if MASTER_API_KEYS and MASTER_API_KEYS[0]:
     for key in MASTER_API_KEYS:
         key = key.strip()
         if key:
-            API_KEYS[key] = {
+            _register_api_key(key, {
                 "name": "Environment Key",
                 "created_at": datetime.utcnow().isoformat() + "Z",
                 "tier": "premium"
-            }
+            })
 
 
 # Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Counters are kept in process memory unless RATE_LIMIT_STORAGE_URI points at
+# a shared store (e.g. redis://host:6379/0), which keeps limits exact across
+# workers and instances. The moving window counts requests over the last
+# minute rather than per calendar minute; if the store is unreachable,
+# limits fall back to per-process memory instead of failing requests.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=os.getenv("RATE_LIMIT_STORAGE_URI", "memory://"),
+    strategy="moving-window",
+    in_memory_fallback_enabled=True
+)
+
+# Extraction runs in worker threads so long scans don't stall the event loop;
+# cap how many run at once so bursts can't spawn unbounded threads. Covers
+# all extraction endpoints; the streaming one takes a slot per batch.
+EXTRACTION_SLOTS = asyncio.Semaphore(os.cpu_count() or 1)
+
+# Number of NDJSON lines sent per chunk by the streaming endpoint
+STREAM_BATCH_SIZE = 1000
+
+# Maximum size of the text accepted by the extraction endpoints (1MB)
+MAX_TEXT_LENGTH = 1000000
+
+# Largest request body accepted at all. A JSON body carrying MAX_TEXT_LENGTH
+# characters can need up to 6 bytes per character (\uXXXX escapes), plus a
+# little room for the surrounding object.
+MAX_REQUEST_BODY_SIZE = 6 * MAX_TEXT_LENGTH + 1024
 
 
 # Initialize FastAPI app
@@ -97,6 +147,69 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+
+class RequestBodyLimitMiddleware:
+    """
+    Reject oversized requests from their Content-Length header.
+    
+    Runs before the body is read, as plain ASGI middleware so accepted
+    requests and streamed responses pass through without extra wrapping.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            response = self.check_content_length(scope)
+            if response is not None:
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+    
+    @staticmethod
+    def check_content_length(scope) -> Optional[JSONResponse]:
+        """Return an error response if Content-Length is invalid or too large."""
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is None:
+            return None
+        
+        # int() would also accept signs, underscores, surrounding whitespace
+        # and non-ASCII digits, none of which are valid in the header
+        if not (content_length.isascii() and content_length.isdigit()):
+            return JSONResponse(
+                status_code=400,
+                content={
+                    "success": False,
+                    "error": "Invalid Content-Length header",
+                    "detail": "Content-Length must be a non-negative integer."
+                }
+            )
+        
+        # The raw endpoint's body is the text itself
+        if scope["path"] == "/api/extract-emails/raw":
+            max_size = MAX_TEXT_LENGTH
+        else:
+            max_size = MAX_REQUEST_BODY_SIZE
+        
+        # Compare digit counts first, so an absurdly long value never hits
+        # int()'s limit on string conversion length
+        digits = content_length.lstrip("0")
+        if len(digits) > len(str(max_size)) or int(digits or "0") > max_size:
+            return JSONResponse(
+                status_code=413,
+                content={
+                    "success": False,
+                    "error": "Request body too large",
+                    "detail": f"Request body must not exceed {max_size} bytes."
+                }
+            )
+        return None
+
+
+# Registered ahead of CORS so rejections still carry CORS headers
+app.add_middleware(RequestBodyLimitMiddleware)
+
 # Configure CORS - allow all origins for maximum compatibility
 app.add_middleware(
     CORSMiddleware,
@@ -132,7 +245,8 @@ async def verify_api_key(x_api_key: Optional[str] = Header(None)) -> dict:
             }
         )
     
-    if x_api_key not in API_KEYS:
+    api_key_info = API_KEYS.get(_hash_api_key(x_api_key))
+    if api_key_info is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail={
@@ -143,7 +257,7 @@ async def verify_api_key(x_api_key: Optional[str] = Header(None)) -> dict:
             }
         )
     
-    return API_KEYS[x_api_key]
+    return api_key_info
 
 
 # Pydantic Models for request/response validation
@@ -153,18 +267,39 @@ class EmailExtractionRequest(BaseModel):
         ...,
         description="The text to search for email addresses",
         min_length=1,
-        max_length=1000000,  # 1MB text limit
+        max_length=MAX_TEXT_LENGTH,
         example="Contact us at support@company.com or sales@company.com. You can also reach John at john.doe@example.org"
     )
     
     @validator('text')
     def text_not_empty(cls, v):
         """Ensure text is not just whitespace."""
-        if not v or not v.strip():
+        if not v or v.isspace():
             raise ValueError('Text cannot be empty or whitespace only')
         return v
 
 
+def is_blank_body(body: bytes) -> bool:
+    """
+    Check a UTF-8 request body the way EmailExtractionRequest checks text.
+    
+    Returns True if the body is empty or decodes to whitespace only,
+    including non-ASCII whitespace such as U+3000. Decodes incrementally and
+    stops at the first non-whitespace character, so a normal body is never
+    decoded in full.
+    """
+    if not body or body.isspace():
+        return True
+    
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    for offset in range(0, len(body), 4096):
+        chunk = decoder.decode(body[offset:offset + 4096])
+        if chunk and not chunk.isspace():
+            return False
+    tail = decoder.decode(b"", final=True)
+    return not tail or tail.isspace()
+
+
 class EmailExtractionResponse(BaseModel):
     """Response model for email extraction endpoint."""
     success: bool = Field(description="Whether the extraction was successful")
@@ -299,7 +434,7 @@ async def health_check():
         }
     }
 )
-@limiter.limit("10/minute")
+@limiter.shared_limit("10/minute", scope="extract-emails")
 async def extract_emails(
     request: Request,
     extraction_request: EmailExtractionRequest,
@@ -313,7 +448,8 @@ async def extract_emails(
     while preserving the order they appear.
     
     **Authentication Required**: Include 'X-API-Key' header with your API key.
-    **Rate Limit**: 10 requests per minute per IP address (free tier).
+    **Rate Limit**: 10 requests per minute per IP address (free tier), shared
+    with /api/extract-emails/stream and /api/extract-emails/raw.
     
     Args:
         request_obj: FastAPI Request object (for rate limiting)
@@ -345,16 +481,227 @@ async def extract_emails(
         ```
     """
     try:
-        # Extract emails using the imported function
-        result = hunt_emails(extraction_request.text)
+        # Extract emails in a worker thread, keeping the event loop free
+        async with EXTRACTION_SLOTS:
+            emails = await asyncio.to_thread(find_emails, extraction_request.text)
         
-        # Return successful response
-        return {
-            "success": True,
-            "emails": result["emails"],
-            "count": result["count"],
-            "text_length": result["text_length"]
+        # Return successful response; the fields are built here, so skip
+        # re-validating them and hand the model straight to FastAPI
+        return EmailExtractionResponse.model_construct(
+            success=True,
+            emails=emails,
+            count=len(emails),
+            text_length=len(extraction_request.text)
+        )
+        
+    except Exception as e:
+        # Handle any unexpected errors
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "success": False,
+                "error": "Failed to extract emails",
+                "detail": str(e)
+            }
+        )
+
+
+@app.post(
+    "/api/extract-emails/stream",
+    response_class=StreamingResponse,
+    summary="Stream Emails from Text",
+    description="Extract email addresses from the provided text and stream them back as newline-delimited JSON, one object per unique email, as they are found. Suited to large inputs with many matches. Requires API key authentication.",
+    tags=["Email Extraction"],
+    responses={
+        200: {
+            "description": "Stream of unique emails, one JSON object per line",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"email": "support@company.com"}\n{"email": "sales@company.com"}\n'
+                }
+            }
+        },
+        401: {
+            "description": "Unauthorized - missing or invalid API key",
+            "model": ErrorResponse
+        },
+        422: {
+            "description": "Validation error - invalid input",
+            "model": ErrorResponse
+        },
+        429: {
+            "description": "Rate limit exceeded",
+            "model": ErrorResponse
         }
+    }
+)
+@limiter.shared_limit("10/minute", scope="extract-emails")
+async def extract_emails_stream(
+    request: Request,
+    extraction_request: EmailExtractionRequest,
+    api_key_info: dict = Depends(verify_api_key)
+):
+    """
+    Stream email addresses from text as newline-delimited JSON.
+    
+    Unlike /api/extract-emails, results are written to the response as they
+    are found instead of being collected into a single JSON document first,
+    so memory use does not grow with the size of the response.
+    
+    **Authentication Required**: Include 'X-API-Key' header with your API key.
+    **Rate Limit**: 10 requests per minute per IP address (free tier), shared
+    with /api/extract-emails and /api/extract-emails/raw.
+    
+    Args:
+        request: FastAPI Request object (for rate limiting)
+        extraction_request: EmailExtractionRequest containing the text to process
+        api_key_info: API key information from authentication
+        
+    Returns:
+        StreamingResponse yielding one `{"email": ...}` JSON object per line
+        
+    Example:
+        ```bash
+        curl -N -X POST "http://localhost:8000/api/extract-emails/stream" \
+             -H "X-API-Key: your_api_key_here" \
+             -H "Content-Type: application/json" \
+             -d '{"text": "Contact support@company.com or sales@company.com"}'
+        ```
+        
+        Response:
+        ```
+        {"email": "support@company.com"}
+        {"email": "sales@company.com"}
+        ```
+    """
+    def next_chunk(emails: Iterator[str]) -> str:
+        return "".join(
+            json.dumps({"email": email}) + "\n"
+            for email in islice(emails, STREAM_BATCH_SIZE)
+        )
+    
+    # Each batch is scanned in a worker thread under EXTRACTION_SLOTS, like
+    # the other extraction endpoints. Batching keeps the thread dispatch off
+    # the per-email path, and the slot is released while the client reads.
+    async def ndjson_chunks() -> AsyncIterator[str]:
+        emails = iter_emails(extraction_request.text)
+        while True:
+            async with EXTRACTION_SLOTS:
+                chunk = await asyncio.to_thread(next_chunk, emails)
+            if not chunk:
+                return
+            yield chunk
+    
+    return StreamingResponse(ndjson_chunks(), media_type="application/x-ndjson")
+
+
+@app.post(
+    "/api/extract-emails/raw",
+    response_model=EmailExtractionResponse,
+    summary="Extract Emails from Raw Text",
+    description="Extract all email addresses from the raw request body, sent as plain text instead of JSON. The body is read as UTF-8 and only the text around each '@' is decoded, and text_length counts bytes. Requires API key authentication.",
+    tags=["Email Extraction"],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/plain": {
+                    "schema": {"type": "string", "maxLength": MAX_TEXT_LENGTH},
+                    "example": "Contact us at support@company.com or sales@company.com"
+                }
+            }
+        }
+    },
+    responses={
+        401: {
+            "description": "Unauthorized - missing or invalid API key",
+            "model": ErrorResponse
+        },
+        413: {
+            "description": "Request body larger than 1MB",
+            "model": ErrorResponse
+        },
+        422: {
+            "description": "Validation error - empty or whitespace-only body",
+            "model": ErrorResponse
+        },
+        429: {
+            "description": "Rate limit exceeded",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    }
+)
+@limiter.shared_limit("10/minute", scope="extract-emails")
+async def extract_emails_raw(
+    request: Request,
+    api_key_info: dict = Depends(verify_api_key)
+):
+    """
+    Extract email addresses from a raw text body.
+    
+    Behaves like /api/extract-emails, but reads the text straight from the
+    request body so large payloads skip JSON parsing, and only the text
+    around each '@' is decoded.
+    
+    **Authentication Required**: Include 'X-API-Key' header with your API key.
+    **Rate Limit**: 10 requests per minute per IP address (free tier), shared
+    with /api/extract-emails and /api/extract-emails/stream.
+    
+    Args:
+        request: FastAPI Request object (for rate limiting and the raw body)
+        api_key_info: API key information from authentication
+        
+    Returns:
+        EmailExtractionResponse with extracted emails and metadata
+        
+    Raises:
+        HTTPException: If the body is too large or empty, or extraction fails
+        
+    Example:
+        ```bash
+        curl -X POST "http://localhost:8000/api/extract-emails/raw" \
+             -H "X-API-Key: your_api_key_here" \
+             -H "Content-Type: text/plain" \
+             --data-binary @contacts.txt
+        ```
+    """
+    body = await request.body()
+    
+    if len(body) > MAX_TEXT_LENGTH:
+        raise HTTPException(
+            status_code=413,
+            detail={
+                "success": False,
+                "error": "Text too large",
+                "detail": f"Request body must not exceed {MAX_TEXT_LENGTH} bytes."
+            }
+        )
+    
+    if is_blank_body(body):
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "success": False,
+                "error": "Invalid input",
+                "detail": "Text cannot be empty or whitespace only"
+            }
+        )
+    
+    try:
+        # Extract emails in a worker thread, keeping the event loop free
+        async with EXTRACTION_SLOTS:
+            emails = await asyncio.to_thread(find_emails, body)
+        
+        return EmailExtractionResponse.model_construct(
+            success=True,
+            emails=emails,
+            count=len(emails),
+            text_length=len(body)
+        )
         
     except Exception as e:
         # Handle any unexpected errors
@@ -456,11 +803,11 @@ async def generate_api_key(request: APIKeyGenerateRequest = APIKeyGenerateReques
         
         # Store the API key
         created_at = datetime.utcnow().isoformat() + "Z"
-        API_KEYS[api_key] = {
+        _register_api_key(api_key, {
             "name": request.name or "Test Key",
             "created_at": created_at,
             "tier": "free"
-        }
+        })
         
         return {
             "success": True,
@@ -531,6 +878,12 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        # libuv event loop and C HTTP parser (uvloop is not available on Windows)
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        # API keys live in process memory, so keep a single worker unless
+        # WEB_CONCURRENCY is set explicitly
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        reload=False,
         log_level="info"
     )
@@ -0,0 +1,91 @@
+"""
+Tests for email_hunter.
+
+The windowed scan in find_emails and iter_emails must return exactly what
+a plain findall over the whole text returns, so every case is checked
+against that reference.
+"""
+
+import random
+import re
+
+import pytest
+
+import email_hunter
+from email_hunter import find_emails, iter_emails
+
+_REFERENCE_RE = re.compile(email_hunter._EMAIL_PATTERN)
+
+
+def reference_emails(text):
+    """Unique emails from a full-text findall, first spelling kept."""
+    if isinstance(text, bytes):
+        text = text.decode('utf-8', 'replace')
+    unique_emails = {}
+    for email in _REFERENCE_RE.findall(text):
+        unique_emails.setdefault(email.lower(), email)
+    return list(unique_emails.values())
+
+
+def random_texts(count, seed):
+    rng = random.Random(seed)
+    alphabet = 'aB1_._%+-@@@ .x.com éü|\n'
+    return [
+        ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 600)))
+        for _ in range(count)
+    ]
+
+
+FIXED_TEXTS = [
+    '',
+    'no addresses here',
+    'Contact john.doe@example.com or JOHN.DOE@example.com today',
+    # VERP bounce address, local part longer than the 64-character window
+    'bounce-' + '0123456789abcdef' * 4 + '-000@amazonses.com',
+    # Domain longer than the 255-character window
+    'john@' + 'ab.' * 120 + 'com',
+    'x ' * 100 + 'a' * 500 + '@' + 'b' * 400 + '.com ' + 'q@w.io',
+    'a' * 70 + '@b.co@' + 'c' * 300 + '.de',
+    # Non-ASCII word characters next to an address are not word boundaries
+    'contact: müller@firma.de',
+    'éric@x.com',
+    'mail@examplé.com',
+    'ü' + 'a' * 70 + '@x.com',
+    'a@' + 'b' * 300 + '.coméx',
+    'A@b.co',
+    '@' * 5000,
+    'a@ ' * 3000,
+    'a@b.co ' * 2000,
+]
+
+
+@pytest.mark.parametrize('text', FIXED_TEXTS + random_texts(2000, seed=3))
+def test_matches_full_text_findall(text):
+    expected = reference_emails(text)
+    assert find_emails(text) == expected
+    assert list(iter_emails(text)) == expected
+
+
+@pytest.mark.parametrize('text', FIXED_TEXTS + random_texts(2000, seed=4))
+def test_bytes_match_full_text_findall(text):
+    body = text.encode()
+    expected = reference_emails(body)
+    assert find_emails(body) == expected
+    assert list(iter_emails(body)) == expected
+
+
+@pytest.mark.parametrize('body', [
+    'contact: müller@firma.de'.encode(),
+    b'\xffjohn@example.com \xe9ric@x.com',
+    b'a' * 70 + b'\xc3@x.com',
+])
+def test_bytes_decode_like_utf8_text(body):
+    assert find_emails(body) == reference_emails(body)
+    assert find_emails(body) == find_emails(body.decode('utf-8', 'replace'))
+
+
+def test_cached_result_is_a_copy():
+    text = ' '.join(f'user{i}@example.com' for i in range(300))
+    first = find_emails(text)
+    first.clear()
+    assert find_emails(text) == reference_emails(text)